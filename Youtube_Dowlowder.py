@@ -6,11 +6,310 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QIcon, QPixmap
 from queue import Queue
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from yt_dlp import YoutubeDL
 import threading
+import time
+import json
 import os
+import re
 import ffmpeg
 
+# Target values for EBU R128 loudness normalization
+LOUDNORM_TARGET = {'I': -16, 'TP': -1.5, 'LRA': 11}
+
+# loudnorm outputs 192 kHz when it falls back to dynamic mode, so pin the output rate
+NORMALIZED_SAMPLE_RATE = 48000
+
+# Video containers that can carry cover art as an attached picture
+COVER_ART_EXTENSIONS = ('.mp4', '.m4a')
+
+# Audio codec used when normalized audio is re-encoded into each video container
+NORMALIZED_AUDIO_CODECS = {'.mp4': 'aac', '.m4a': 'aac', '.mkv': 'aac', '.webm': 'libopus'}
+
+# Trim times in [[HH:]MM:]SS[.ms] form
+TIMESTAMP_PATTERN = re.compile(r'(?:(?:(\d+):)?(\d+):)?(\d+(?:\.\d+)?)')
+
+
+def parse_timestamp(text):
+    """Convert a trim time to seconds, or None when the field is empty"""
+    text = text.strip()
+    if not text:
+        return None
+    match = TIMESTAMP_PATTERN.fullmatch(text)
+    if not match:
+        raise ValueError(f"Invalid trim time '{text}'. Use seconds or [HH:]MM:SS.")
+    hours, minutes, seconds = match.groups()
+    return int(hours or 0) * 3600 + int(minutes or 0) * 60 + float(seconds)
+
+
+class FfmpegRunner:
+    """Runs the ffmpeg commands of pipeline steps so they can be killed on stop"""
+
+    def __init__(self):
+        self.processes = set()
+        self.lock = threading.Lock()
+        self.stopped = False
+
+    def run(self, stream):
+        """Run an ffmpeg stream to completion and return (stdout, stderr)"""
+        with self.lock:
+            if self.stopped:
+                raise RuntimeError("Post-processing was stopped")
+            process = ffmpeg.run_async(stream, pipe_stdout=True, pipe_stderr=True, overwrite_output=True)
+            self.processes.add(process)
+        try:
+            stdout, stderr = process.communicate()
+        finally:
+            with self.lock:
+                self.processes.discard(process)
+
+        if process.returncode:
+            raise ffmpeg.Error('ffmpeg', stdout, stderr)
+        return stdout, stderr
+
+    def kill_all(self):
+        """Kill running ffmpeg processes and refuse to start new ones"""
+        with self.lock:
+            self.stopped = True
+            for process in self.processes:
+                process.kill()
+
+
+def trim_clip_step(context, inputs):
+    """Cut the downloaded video to the requested start/end times into a temp file"""
+    options = context['options']
+    trimmed_path = context['temp_paths']['trim']
+
+    input_kwargs = {}
+    if options['trim_start'] is not None:
+        input_kwargs['ss'] = options['trim_start']
+    if options['trim_end'] is not None:
+        input_kwargs['to'] = options['trim_end']
+
+    stream = ffmpeg.input(context['video_path'], **input_kwargs)
+    stream = ffmpeg.output(stream, trimmed_path, c='copy')
+    context['ffmpeg'].run(stream)
+    return trimmed_path
+
+
+def prepare_thumbnail_step(context, inputs):
+    """Convert the thumbnail written by yt-dlp into a JPEG cover image"""
+    thumbnail_path = context['metadata']['thumbnail']
+    cover_path = context['temp_paths']['cover']
+
+    stream = ffmpeg.input(thumbnail_path)
+    stream = ffmpeg.output(stream, cover_path, vframes=1)
+    context['ffmpeg'].run(stream)
+    return cover_path
+
+
+def measure_loudness_step(context, inputs):
+    """Run the loudnorm analysis pass and return the measured values"""
+    source_path = inputs.get('trim') or context['video_path']
+
+    stream = ffmpeg.input(source_path).audio
+    stream = stream.filter('loudnorm', print_format='json', **LOUDNORM_TARGET)
+    stream = ffmpeg.output(stream, '-', format='null')
+    _, stderr = context['ffmpeg'].run(stream)
+
+    # loudnorm prints its measurements as the last JSON block on stderr
+    text = stderr.decode('utf-8', errors='replace')
+    return json.loads(text[text.rindex('{'):text.rindex('}') + 1])
+
+
+def encode_output_step(context, inputs):
+    """Write the final file in a single ffmpeg pass.
+
+    Applies MP3 conversion, the measured loudness correction, metadata
+    tags and the cover image together so the media is only re-read once.
+    """
+    options = context['options']
+    metadata = context['metadata']
+    video_path = context['video_path']
+    source_path = inputs.get('trim') or video_path
+    measured = inputs.get('loudness')
+    cover_path = inputs.get('thumbnail')
+
+    source = ffmpeg.input(source_path)
+    audio = source.audio
+    if measured:
+        audio = audio.filter(
+            'loudnorm',
+            measured_I=measured['input_i'],
+            measured_TP=measured['input_tp'],
+            measured_LRA=measured['input_lra'],
+            measured_thresh=measured['input_thresh'],
+            offset=measured['target_offset'],
+            linear='true',
+            **LOUDNORM_TARGET
+        )
+
+    # Write to a temp file so a killed or failed encode never leaves a partial output
+    if options['convert_mp3']:
+        final_path = os.path.splitext(video_path)[0] + '.mp3'
+        output_path = context['temp_paths']['encode_mp3']
+        streams = [audio]
+        output_kwargs = {'acodec': 'libmp3lame', 'q': 4, 'id3v2_version': 3}
+    else:
+        final_path = video_path
+        output_path = context['temp_paths']['encode']
+        streams = [source.video, audio]
+        extension = os.path.splitext(video_path)[1].lower()
+        output_kwargs = {'acodec': NORMALIZED_AUDIO_CODECS[extension] if measured else 'copy'}
+
+    if cover_path:
+        streams.append(ffmpeg.input(cover_path).video)
+        output_kwargs['vcodec'] = 'copy'
+        if not options['convert_mp3']:
+            output_kwargs['disposition:v:1'] = 'attached_pic'
+    elif not options['convert_mp3']:
+        output_kwargs['vcodec'] = 'copy'
+
+    if measured:
+        output_kwargs['ar'] = NORMALIZED_SAMPLE_RATE
+
+    if options['add_tags']:
+        tags = [(key, metadata[key]) for key in ('title', 'artist', 'date', 'comment') if metadata[key]]
+        for index, (key, value) in enumerate(tags):
+            output_kwargs[f'metadata:g:{index}'] = f"{key}={value}"
+
+    stream = ffmpeg.output(*streams, output_path, **output_kwargs)
+    context['ffmpeg'].run(stream)
+
+    os.replace(output_path, final_path)
+    return final_path
+
+
+def delete_video_step(context, inputs):
+    """Remove the source video once the MP3 has been written"""
+    os.remove(context['video_path'])
+    return context['video_path']
+
+
+def remove_intermediate_files(context):
+    """Delete temp files and the yt-dlp thumbnail left by a pipeline run"""
+    paths = list(context['temp_paths'].values()) + [context['metadata']['thumbnail']]
+    for path in paths:
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Warning: Could not remove {path}: {e}")
+
+
+def run_step(func, context, inputs):
+    """Execute a pipeline step on a pool worker and time it"""
+    start = time.perf_counter()
+    result = func(context, inputs)
+    return result, time.perf_counter() - start
+
+
+class PostProcessStep:
+    """A named post-processing function and the steps it depends on"""
+
+    def __init__(self, name, func, deps=(), optional=False):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.optional = optional  # A failure passes None to dependents instead of aborting
+
+
+class PostProcessPipeline:
+    """Small DAG of post-processing steps for a single video.
+
+    Each step is called as ``func(context, inputs)`` where ``inputs`` maps
+    dependency names to their results. Steps whose dependencies are done
+    are submitted to the shared executor together, so independent steps
+    run concurrently. If a required step fails, no further steps start and
+    the error is raised once the steps already running have finished.
+    """
+
+    def __init__(self):
+        self.steps = {}
+
+    def add_step(self, name, func, deps=(), optional=False):
+        """Register a step; dependencies must already be registered"""
+        if name in self.steps:
+            raise ValueError(f"Duplicate post-processing step: {name}")
+        missing = [dep for dep in deps if dep not in self.steps]
+        if missing:
+            raise ValueError(f"Step '{name}' depends on unknown steps: {', '.join(missing)}")
+        self.steps[name] = PostProcessStep(name, func, deps, optional)
+        return self
+
+    def run(self, executor, context, on_step_done=None, on_step_failed=None,
+            is_running=lambda: True):
+        """Run all steps on the executor and return their results by name"""
+        results = {}
+        pending = dict(self.steps)
+        running = {}
+        error = None
+
+        while pending or running:
+            if error is None and is_running():
+                for name, step in list(pending.items()):
+                    if all(dep in results for dep in step.deps):
+                        inputs = {dep: results[dep] for dep in step.deps}
+                        future = executor.submit(run_step, step.func, context, inputs)
+                        running[future] = name
+                        del pending[name]
+
+            if not running:  # Stopped or failed before the remaining steps could start
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                if future.cancelled():
+                    continue
+                try:
+                    results[name], elapsed = future.result()
+                except Exception as e:
+                    if self.steps[name].optional:
+                        results[name] = None
+                        if on_step_failed:
+                            on_step_failed(name, e)
+                    elif error is None:
+                        error = e
+                        for other in running:  # Drop steps that have not started yet
+                            other.cancel()
+                    continue
+                if on_step_done:
+                    on_step_done(name, elapsed)
+
+        if error is not None:
+            raise error
+        return results
+
+
+def build_postprocess_pipeline(options, video_path, has_thumbnail):
+    """Build the post-processing DAG for the selected options"""
+    pipeline = PostProcessPipeline()
+    encode_deps = []
+    extension = os.path.splitext(video_path)[1].lower()
+    supports_cover = options['convert_mp3'] or extension in COVER_ART_EXTENSIONS
+    supports_normalize = options['convert_mp3'] or extension in NORMALIZED_AUDIO_CODECS
+
+    if options['trim_start'] is not None or options['trim_end'] is not None:
+        pipeline.add_step('trim', trim_clip_step)
+        encode_deps.append('trim')
+    if options['embed_thumbnail'] and has_thumbnail and supports_cover:
+        pipeline.add_step('thumbnail', prepare_thumbnail_step, optional=True)
+        encode_deps.append('thumbnail')
+    if options['normalize_audio'] and supports_normalize:
+        pipeline.add_step('loudness', measure_loudness_step, deps=['trim'] if 'trim' in pipeline.steps else [])
+        encode_deps.append('loudness')
+
+    # The encode writes the final file, replacing the source only for video output
+    if options['convert_mp3'] or options['add_tags'] or encode_deps:
+        pipeline.add_step('encode', encode_output_step, deps=encode_deps)
+        if options['convert_mp3'] and options['delete_video']:
+            pipeline.add_step('delete', delete_video_step, deps=['encode'])
+
+    return pipeline
+
+
 class DownloadThread(QThread):
     progress_signal = pyqtSignal(tuple)
     
@@ -23,6 +322,12 @@ class DownloadThread(QThread):
         self.ydl = None  # Add this to store YoutubeDL instance
         self.current_percentage = 0  # Add this to track progress
         self.max_total_bytes = 0     # Add this to track max file size
+        self.postprocess_options = self.get_postprocess_options()
+        self.executor = None             # Shared by all post-processing steps, created on first use
+        self.ffmpeg = FfmpegRunner()
+        self.postprocess_threads = []
+        self.step_timings = {}           # Total seconds spent per post-processing step
+        self.timings_lock = threading.Lock()
         
     def run(self):
         try:
@@ -32,17 +337,30 @@ class DownloadThread(QThread):
                     break
                 self.progress_signal.emit(('status', f"Processing video {index} of {total_videos}"))
                 self.download_video(url)
+
+            # Post-processing runs alongside later downloads, wait for it here
+            for thread in self.postprocess_threads:
+                thread.join()
                 
             if self.is_running:  # Only emit completion if we weren't stopped
+                if self.step_timings:
+                    summary = ', '.join(f"{name} {seconds:.1f}s" for name, seconds in self.step_timings.items())
+                    self.progress_signal.emit(('timing', f"Total post-processing time: {summary}"))
                 self.progress_signal.emit(('complete', f"Completed downloading {total_videos} videos!"))
         except Exception as e:
             self.progress_signal.emit(('error', str(e)))
+        finally:
+            if self.executor:
+                self.executor.shutdown(wait=False)
 
     def stop(self):
         """Safely stop the thread"""
         self.is_running = False
         if self.ydl:  # Add this to cancel download
             self.ydl.cancel_download()
+        if self.executor:  # Drop queued post-processing steps
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.ffmpeg.kill_all()  # Running steps fail fast once their ffmpeg is killed
 
     def download_video(self, url):
         def progress_hook(d):
@@ -92,6 +410,7 @@ class DownloadThread(QThread):
                 'quiet': True,
                 'progress_hooks': [progress_hook],
                 'noprogress': False,
+                'writethumbnail': self.postprocess_options['embed_thumbnail'],
                 'http_headers': {
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
                     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -111,8 +430,8 @@ class DownloadThread(QThread):
                 
             video_path = self.ydl.prepare_filename(info)
             
-            if self.app.convert_mp3_check.isChecked() and self.is_running:
-                self.app.convert_to_mp3_file(video_path)
+            if self.is_running:
+                self.start_postprocess(video_path, info)
                     
         except Exception as e:
             if self.is_running:  # Only emit error if not stopped
@@ -120,6 +439,80 @@ class DownloadThread(QThread):
         finally:
             self.ydl = None  # Clear the reference
 
+    def get_postprocess_options(self):
+        """Snapshot the post-processing options selected in the UI"""
+        trim_start = parse_timestamp(self.app.trim_start_input.text())
+        trim_end = parse_timestamp(self.app.trim_end_input.text())
+        if trim_start is not None and trim_end is not None and trim_end <= trim_start:
+            raise ValueError("Trim end must be after trim start.")
+
+        return {
+            'convert_mp3': self.app.convert_mp3_check.isChecked(),
+            'delete_video': self.app.delete_video_check.isChecked(),
+            'normalize_audio': self.app.normalize_audio_check.isChecked(),
+            'embed_thumbnail': self.app.embed_thumbnail_check.isChecked(),
+            'add_tags': self.app.add_tags_check.isChecked(),
+            'trim_start': trim_start,
+            'trim_end': trim_end,
+        }
+
+    def start_postprocess(self, video_path, info):
+        """Run the post-processing pipeline for a video in the background"""
+        thumbnail_path = next(
+            (t['filepath'] for t in reversed(info.get('thumbnails') or []) if t.get('filepath')),
+            None
+        )
+        pipeline = build_postprocess_pipeline(self.postprocess_options, video_path, thumbnail_path is not None)
+        root, ext = os.path.splitext(video_path)
+        context = {
+            'ffmpeg': self.ffmpeg,
+            'video_path': video_path,
+            'options': self.postprocess_options,
+            'temp_paths': {
+                'trim': f"{root}.trim{ext}",
+                'encode': f"{root}.post{ext}",
+                'encode_mp3': f"{root}.post.mp3",
+                'cover': f"{root}.cover.jpg",
+            },
+            'metadata': {
+                'title': info.get('title'),
+                'artist': info.get('uploader'),
+                'date': (info.get('upload_date') or '')[:4],
+                'comment': info.get('webpage_url'),
+                'thumbnail': thumbnail_path,
+            },
+        }
+        if not pipeline.steps:
+            remove_intermediate_files(context)  # Thumbnail of a container without cover art
+            return
+
+        if self.executor is None:
+            # Steps spend their time waiting on ffmpeg subprocesses, so threads are enough
+            self.executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+        thread = threading.Thread(target=self.run_postprocess, args=(pipeline, context), daemon=True)
+        self.postprocess_threads.append(thread)
+        thread.start()
+
+    def run_postprocess(self, pipeline, context):
+        """Execute a pipeline and report per-step timing on the progress stream"""
+        title = context['metadata']['title']
+
+        def step_done(name, elapsed):
+            with self.timings_lock:
+                self.step_timings[name] = self.step_timings.get(name, 0) + elapsed
+            self.progress_signal.emit(('timing', f"{title}: {name} finished in {elapsed:.2f}s"))
+
+        def step_failed(name, error):
+            self.progress_signal.emit(('timing', f"{title}: {name} failed and was skipped ({error})"))
+
+        try:
+            pipeline.run(self.executor, context, step_done, step_failed, lambda: self.is_running)
+        except Exception as e:
+            if self.is_running:  # Only emit error if not stopped
+                self.progress_signal.emit(('error', f"Post-processing failed for {title}: {str(e)}"))
+        finally:
+            remove_intermediate_files(context)
+
     def format_size(self, bytes_size):
         """Convert bytes to human readable format"""
         if bytes_size == 0:
@@ -311,6 +704,39 @@ class YouTubeDownloaderApp(QMainWindow):
         conversion_frame.addWidget(self.delete_video_check)
         options_layout.addLayout(conversion_frame)
 
+        # Post-processing options
+        postprocess_frame = QHBoxLayout()
+        self.normalize_audio_check = QCheckBox("Normalize loudness")
+        self.normalize_audio_check.setFont(self.normal_font)
+        postprocess_frame.addWidget(self.normalize_audio_check)
+
+        self.embed_thumbnail_check = QCheckBox("Embed thumbnail")
+        self.embed_thumbnail_check.setFont(self.normal_font)
+        postprocess_frame.addWidget(self.embed_thumbnail_check)
+
+        self.add_tags_check = QCheckBox("Add metadata tags")
+        self.add_tags_check.setFont(self.normal_font)
+        postprocess_frame.addWidget(self.add_tags_check)
+        options_layout.addLayout(postprocess_frame)
+
+        # Clip trimming
+        trim_frame = QHBoxLayout()
+        trim_label = QLabel("Trim:")
+        trim_label.setFont(self.normal_font)
+        trim_frame.addWidget(trim_label)
+
+        self.trim_start_input = QLineEdit()
+        self.trim_start_input.setFont(self.normal_font)
+        self.trim_start_input.setPlaceholderText("Start (e.g. 0:30)")
+        trim_frame.addWidget(self.trim_start_input)
+
+        self.trim_end_input = QLineEdit()
+        self.trim_end_input.setFont(self.normal_font)
+        self.trim_end_input.setPlaceholderText("End (e.g. 2:15)")
+        trim_frame.addWidget(self.trim_end_input)
+        trim_frame.addStretch()
+        options_layout.addLayout(trim_frame)
+
         layout.addWidget(options_group)
 
         # Download Button
@@ -336,6 +762,14 @@ class YouTubeDownloaderApp(QMainWindow):
         self.status_label.setWordWrap(True)
         progress_layout.addWidget(self.status_label)
 
+        # Per-step post-processing timings, kept apart from the download status
+        self.postprocess_log = QTextEdit()
+        self.postprocess_log.setFont(self.status_font)
+        self.postprocess_log.setReadOnly(True)
+        self.postprocess_log.setMaximumHeight(90)
+        self.postprocess_log.setPlaceholderText("Post-processing step timings")
+        progress_layout.addWidget(self.postprocess_log)
+
         layout.addWidget(progress_group)
 
     def choose_save_location(self):
@@ -401,15 +835,22 @@ class YouTubeDownloaderApp(QMainWindow):
             QMessageBox.warning(self, "Warning", "Please choose a save location.")
             return
 
+        # Create the download thread, this validates the post-processing options
+        try:
+            self.download_thread = DownloadThread(self, urls, save_path)
+        except ValueError as e:
+            QMessageBox.warning(self, "Warning", str(e))
+            return
+
         # Disable download button during download
         self.download_btn.setEnabled(False)
 
         # Reset progress and status
         self.status_label.setText("Starting downloads...")
         self.progress_bar.setValue(0)
+        self.postprocess_log.clear()
 
-        # Create and start new download thread
-        self.download_thread = DownloadThread(self, urls, save_path)
+        # Start new download thread
         self.download_thread.progress_signal.connect(self.update_progress)
         self.download_thread.finished.connect(self.thread_finished)
         self.download_thread.start()
@@ -424,105 +865,6 @@ class YouTubeDownloaderApp(QMainWindow):
                 self.status_label.setText("✅ All downloads completed successfully!")
                 QMessageBox.information(self, "Success", "All videos downloaded successfully!")
 
-    def process_download_queue(self, urls, save_path):
-        """Process multiple URLs one at a time"""
-        total_videos = len(urls)
-        for index, url in enumerate(urls, 1):
-            try:
-                self.status_label.setText(f"Processing video {index} of {total_videos}")
-                self.download_video(url, save_path)
-                # Wait for the current download to complete
-                while not self.progress_queue.empty():
-                    msg_type, _ = self.progress_queue.get()
-                    if msg_type in ['complete', 'error']:
-                        break
-            except Exception as e:
-                self.progress_queue.put(('error', f"Error downloading {url}: {str(e)}"))
-
-        # Final completion message
-        self.progress_queue.put(('complete', f"Completed downloading {total_videos} videos!"))
-
-    def convert_to_mp3_file(self, video_path):
-        try:
-            output_path = os.path.splitext(video_path)[0] + '.mp3'
-            self.status_label.setText("Converting to MP3...")
-            
-            stream = ffmpeg.input(video_path)
-            stream = ffmpeg.output(stream, output_path, acodec='libmp3lame', q=4)
-            ffmpeg.run(stream, capture_stdout=True, capture_stderr=True)
-            
-            if self.delete_video_check.isChecked():
-                os.remove(video_path)
-                
-            self.status_label.setText("MP3 conversion completed!")
-            return True
-        except Exception as e:
-            self.status_label.setText(f"MP3 conversion failed: {str(e)}")
-            return False
-
-    def download_video(self, url, save_path):
-        def progress_hook(d):
-            if d['status'] == 'downloading':
-                try:
-                    # Get raw values instead of formatted strings
-                    downloaded = d.get('downloaded_bytes', 0)
-                    total = d.get('total_bytes', 0) or d.get('total_bytes_estimate', 0)
-                    speed = d.get('speed', 0)
-                    eta = d.get('eta', 0)
-
-                    # Calculate percentage
-                    if total > 0:
-                        percentage = (downloaded / total) * 100
-                    else:
-                        percentage = 0
-
-                    # Format values in a clean way
-                    formatted_data = {
-                        'percent': f"{percentage:.1f}%",
-                        'size': self.format_size(total),
-                        'speed': self.format_speed(speed),
-                        'eta': self.format_time(eta)
-                    }
-
-                    self.progress_queue.put(('progress', formatted_data))
-                except Exception as e:
-                    print(f"Error in progress_hook: {e}")
-
-            elif d['status'] == 'finished':
-                self.progress_queue.put(('status', 'Finalizing download...'))
-
-        try:
-            ydl_opts = {
-                'outtmpl': f'{save_path}/%(title)s.%(ext)s',
-                'format': self.get_format_string(),  # Use the selected quality
-                'merge_output_format': 'mp4',
-                'quiet': True,
-                'progress_hooks': [progress_hook],
-                'noprogress': False,
-                'http_headers': {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    'Accept-Language': 'en-us,en;q=0.5',
-                    'Accept-Encoding': 'gzip, deflate',
-                    'Accept-Charset': 'ISO-8859-1,utf-8;q=0.7,*;q=0.7',
-                }
-            }
-                
-            with YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
-                video_path = ydl.prepare_filename(info)
-                
-                if self.convert_mp3_check.isChecked():
-                    if self.convert_to_mp3_file(video_path):
-                        self.progress_queue.put(('complete', "Video downloaded and converted to MP3 successfully!"))
-                    else:
-                        self.progress_queue.put(('error', "MP3 conversion failed"))
-                else:
-                    self.progress_queue.put(('complete', None))
-                    
-        except Exception as e:
-            self.progress_queue.put(('error', str(e)))
-
     def format_size(self, bytes_size):
         """Convert bytes to human readable format"""
         if bytes_size == 0:
@@ -612,6 +954,9 @@ class YouTubeDownloaderApp(QMainWindow):
         elif msg_type == 'status':
             self.status_label.setText(msg_content)
             
+        elif msg_type == 'timing':
+            self.postprocess_log.append(msg_content)
+            
         elif msg_type == 'complete':
             self.status_label.setText(msg_content or "✅ Download completed successfully!")
             self.progress_bar.setValue(100)
@@ -0,0 +1,392 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ffmpeg
+import pytest
+
+from Youtube_Dowlowder import (PostProcessPipeline, build_postprocess_pipeline,
+                               encode_output_step, measure_loudness_step,
+                               parse_timestamp, trim_clip_step)
+
+LOUDNORM_STDERR = b'''size=N/A time=00:03:12.00 bitrate=N/A speed= 412x
+[Parsed_loudnorm_0 @ 0x55d5c8a0c0c0] 
+{
+	"input_i" : "-23.54",
+	"input_tp" : "-7.96",
+	"input_lra" : "4.90",
+	"input_thresh" : "-34.10",
+	"output_i" : "-16.01",
+	"output_tp" : "-1.50",
+	"output_lra" : "3.80",
+	"output_thresh" : "-26.45",
+	"normalization_type" : "dynamic",
+	"target_offset" : "0.01"
+}
+'''
+
+MEASURED = {
+    'input_i': '-23.54',
+    'input_tp': '-7.96',
+    'input_lra': '4.90',
+    'input_thresh': '-34.10',
+    'target_offset': '0.01',
+}
+
+
+def make_options(**overrides):
+    options = {
+        'convert_mp3': False,
+        'delete_video': False,
+        'normalize_audio': False,
+        'embed_thumbnail': False,
+        'add_tags': False,
+        'trim_start': None,
+        'trim_end': None,
+    }
+    options.update(overrides)
+    return options
+
+
+class RecordingFfmpeg:
+    """Stands in for FfmpegRunner, recording command lines instead of running them"""
+
+    def __init__(self, stderr=b'', error=None):
+        self.commands = []
+        self.stderr = stderr
+        self.error = error
+
+    def run(self, stream):
+        args = ffmpeg.compile(stream)
+        self.commands.append(args)
+        if self.error:
+            raise self.error
+        if args[-1] != '-':
+            open(args[-1], 'wb').close()  # Let the step move its output into place
+        return b'', self.stderr
+
+
+def make_context(tmp_path, runner, video_name='video.mp4', **options):
+    video_path = str(tmp_path / video_name)
+    root, ext = os.path.splitext(video_path)
+    open(video_path, 'wb').close()
+    return {
+        'ffmpeg': runner,
+        'video_path': video_path,
+        'options': make_options(**options),
+        'temp_paths': {
+            'trim': f"{root}.trim{ext}",
+            'encode': f"{root}.post{ext}",
+            'encode_mp3': f"{root}.post.mp3",
+            'cover': f"{root}.cover.jpg",
+        },
+        'metadata': {
+            'title': 'Title',
+            'artist': 'Uploader',
+            'date': '2024',
+            'comment': 'https://example.com/watch',
+            'thumbnail': str(tmp_path / 'video.webp'),
+        },
+    }
+
+
+def option(args, flag):
+    return args[args.index(flag) + 1]
+
+
+def record(name, calls, result=None):
+    def step(context, inputs):
+        calls.append((name, dict(inputs)))
+        return result if result is not None else name
+    return step
+
+
+def fail(context, inputs):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
+
+
+def test_steps_run_after_their_dependencies(executor):
+    calls = []
+    pipeline = (PostProcessPipeline()
+                .add_step('a', record('a', calls))
+                .add_step('b', record('b', calls), deps=['a'])
+                .add_step('c', record('c', calls), deps=['a', 'b']))
+
+    results = pipeline.run(executor, {})
+
+    assert [name for name, _ in calls] == ['a', 'b', 'c']
+    assert calls[2][1] == {'a': 'a', 'b': 'b'}
+    assert results == {'a': 'a', 'b': 'b', 'c': 'c'}
+
+
+def test_independent_steps_run_concurrently(executor):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def meet(context, inputs):
+        barrier.wait()  # Breaks with an error unless both steps run at once
+        return True
+
+    pipeline = PostProcessPipeline().add_step('a', meet).add_step('b', meet)
+
+    assert pipeline.run(executor, {}) == {'a': True, 'b': True}
+
+
+def test_step_timings_are_reported(executor):
+    timings = []
+    pipeline = PostProcessPipeline().add_step('a', record('a', []))
+
+    pipeline.run(executor, {}, on_step_done=lambda name, elapsed: timings.append((name, elapsed)))
+
+    assert len(timings) == 1
+    assert timings[0][0] == 'a' and timings[0][1] >= 0
+
+
+def test_duplicate_step_raises():
+    pipeline = PostProcessPipeline().add_step('a', fail)
+    with pytest.raises(ValueError):
+        pipeline.add_step('a', fail)
+
+
+def test_unknown_dependency_raises():
+    with pytest.raises(ValueError):
+        PostProcessPipeline().add_step('a', fail, deps=['missing'])
+
+
+def test_stop_prevents_new_steps(executor):
+    calls = []
+    running = [True]
+
+    def first(context, inputs):
+        running[0] = False
+        return 'first'
+
+    pipeline = (PostProcessPipeline()
+                .add_step('first', first)
+                .add_step('second', record('second', calls), deps=['first']))
+
+    results = pipeline.run(executor, {}, is_running=lambda: running[0])
+
+    assert results == {'first': 'first'}
+    assert calls == []
+
+
+def test_required_failure_waits_for_running_steps_and_raises(executor):
+    calls = []
+
+    def slow(context, inputs):
+        time.sleep(0.2)
+        calls.append(('slow', {}))
+        return 'slow'
+
+    pipeline = (PostProcessPipeline()
+                .add_step('slow', slow)
+                .add_step('broken', fail)
+                .add_step('after', record('after', calls), deps=['slow', 'broken']))
+
+    with pytest.raises(RuntimeError, match="boom"):
+        pipeline.run(executor, {})
+
+    assert [name for name, _ in calls] == ['slow']
+
+
+def test_optional_failure_passes_none_to_dependents(executor):
+    calls = []
+    failures = []
+    pipeline = (PostProcessPipeline()
+                .add_step('thumbnail', fail, optional=True)
+                .add_step('encode', record('encode', calls), deps=['thumbnail']))
+
+    results = pipeline.run(executor, {}, on_step_failed=lambda name, error: failures.append(name))
+
+    assert failures == ['thumbnail']
+    assert calls == [('encode', {'thumbnail': None})]
+    assert results['encode'] == 'encode'
+
+
+def test_no_options_builds_empty_pipeline():
+    assert build_postprocess_pipeline(make_options(), 'video.mp4', True).steps == {}
+
+
+def test_mp3_with_all_options_builds_full_graph():
+    options = make_options(convert_mp3=True, delete_video=True, normalize_audio=True,
+                           embed_thumbnail=True, add_tags=True, trim_start=5.0)
+    steps = build_postprocess_pipeline(options, 'video.webm', True).steps
+
+    assert list(steps) == ['trim', 'thumbnail', 'loudness', 'encode', 'delete']
+    assert steps['thumbnail'].optional
+    assert steps['loudness'].deps == ('trim',)
+    assert steps['encode'].deps == ('trim', 'thumbnail', 'loudness')
+    assert steps['delete'].deps == ('encode',)
+
+
+def test_delete_requires_mp3_conversion():
+    steps = build_postprocess_pipeline(make_options(delete_video=True, add_tags=True), 'video.mp4', False).steps
+    assert list(steps) == ['encode']
+
+
+def test_trim_alone_still_encodes_video_output():
+    steps = build_postprocess_pipeline(make_options(trim_end=60.0), 'video.mp4', False).steps
+    assert list(steps) == ['trim', 'encode']
+    assert steps['encode'].deps == ('trim',)
+
+
+@pytest.mark.parametrize('video_path, has_thumbnail, expected', [
+    ('video.mp4', True, True),
+    ('video.webm', True, False),
+    ('video.mkv', True, False),
+    ('video.mp4', False, False),
+])
+def test_thumbnail_step_depends_on_container(video_path, has_thumbnail, expected):
+    options = make_options(embed_thumbnail=True)
+    steps = build_postprocess_pipeline(options, video_path, has_thumbnail).steps
+    assert ('thumbnail' in steps) is expected
+
+
+@pytest.mark.parametrize('video_path, expected', [
+    ('video.mp4', True),
+    ('video.webm', True),
+    ('video.flv', False),
+])
+def test_loudness_step_depends_on_container(video_path, expected):
+    steps = build_postprocess_pipeline(make_options(normalize_audio=True), video_path, False).steps
+    assert ('loudness' in steps) is expected
+
+
+def test_mp3_output_normalizes_any_container():
+    options = make_options(convert_mp3=True, normalize_audio=True)
+    assert 'loudness' in build_postprocess_pipeline(options, 'video.flv', False).steps
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('', None),
+    ('45', 45.0),
+    ('1:30', 90.0),
+    ('1:02:03.5', 3723.5),
+])
+def test_parse_timestamp(text, expected):
+    assert parse_timestamp(text) == expected
+
+
+@pytest.mark.parametrize('text', ['abc', '-5', '1:2:3:4', '1e3'])
+def test_parse_timestamp_rejects_invalid_input(text):
+    with pytest.raises(ValueError):
+        parse_timestamp(text)
+
+
+def test_mp3_encode_applies_loudness_cover_and_tags(tmp_path):
+    runner = RecordingFfmpeg()
+    context = make_context(tmp_path, runner, convert_mp3=True, add_tags=True)
+    inputs = {'loudness': MEASURED, 'thumbnail': context['temp_paths']['cover']}
+
+    output_path = encode_output_step(context, inputs)
+
+    args = runner.commands[0]
+    loudnorm = option(args, '-filter_complex')
+    assert 'measured_I=-23.54' in loudnorm and 'offset=0.01' in loudnorm
+    assert 'linear=true' in loudnorm
+    assert option(args, '-acodec') == 'libmp3lame'
+    assert option(args, '-ar') == '48000'
+    assert option(args, '-id3v2_version') == '3'
+    assert option(args, '-vcodec') == 'copy'
+    assert '1:v' in args and '-disposition:v:1' not in args
+    assert option(args, '-metadata:g:0') == 'title=Title'
+    assert option(args, '-metadata:g:3') == 'comment=https://example.com/watch'
+    assert args[-1] == context['temp_paths']['encode_mp3']
+    assert output_path == str(tmp_path / 'video.mp3')
+    assert os.path.exists(output_path)
+    assert not os.path.exists(context['temp_paths']['encode_mp3'])
+
+
+def test_video_encode_attaches_cover_and_copies_streams(tmp_path):
+    runner = RecordingFfmpeg()
+    context = make_context(tmp_path, runner)
+    inputs = {'thumbnail': context['temp_paths']['cover']}
+
+    output_path = encode_output_step(context, inputs)
+
+    args = runner.commands[0]
+    assert option(args, '-disposition:v:1') == 'attached_pic'
+    assert option(args, '-acodec') == 'copy'
+    assert option(args, '-vcodec') == 'copy'
+    assert '-ar' not in args
+    assert not any(arg.startswith('-metadata') for arg in args)
+    assert output_path == context['video_path']
+    assert not os.path.exists(context['temp_paths']['encode'])
+
+
+@pytest.mark.parametrize('video_name, codec', [
+    ('video.mp4', 'aac'),
+    ('video.mkv', 'aac'),
+    ('video.webm', 'libopus'),
+])
+def test_normalized_video_audio_codec_matches_container(tmp_path, video_name, codec):
+    runner = RecordingFfmpeg()
+    context = make_context(tmp_path, runner, video_name=video_name)
+
+    encode_output_step(context, {'loudness': MEASURED})
+
+    args = runner.commands[0]
+    assert option(args, '-acodec') == codec
+    assert option(args, '-ar') == '48000'
+
+
+def test_encode_reads_trimmed_clip_and_skips_empty_tags(tmp_path):
+    runner = RecordingFfmpeg()
+    context = make_context(tmp_path, runner, add_tags=True)
+    context['metadata']['date'] = ''
+
+    encode_output_step(context, {'trim': context['temp_paths']['trim']})
+
+    args = runner.commands[0]
+    assert option(args, '-i') == context['temp_paths']['trim']
+    assert option(args, '-metadata:g:1') == 'artist=Uploader'
+    assert option(args, '-metadata:g:2') == 'comment=https://example.com/watch'
+    assert '-metadata:g:3' not in args
+
+
+def test_failed_mp3_encode_keeps_existing_mp3(tmp_path):
+    runner = RecordingFfmpeg(error=ffmpeg.Error('ffmpeg', b'', b'killed'))
+    context = make_context(tmp_path, runner, convert_mp3=True)
+    existing_mp3 = tmp_path / 'video.mp3'
+    existing_mp3.write_bytes(b'old')
+
+    with pytest.raises(ffmpeg.Error):
+        encode_output_step(context, {})
+
+    assert existing_mp3.read_bytes() == b'old'
+
+
+def test_trim_writes_temp_clip_and_keeps_source(tmp_path):
+    runner = RecordingFfmpeg()
+    context = make_context(tmp_path, runner, trim_start=5.0, trim_end=65.5)
+
+    trimmed_path = trim_clip_step(context, {})
+
+    args = runner.commands[0]
+    assert args.index('-ss') < args.index('-i')
+    assert option(args, '-ss') == '5.0'
+    assert option(args, '-to') == '65.5'
+    assert option(args, '-c') == 'copy'
+    assert trimmed_path == args[-1] == context['temp_paths']['trim']
+    assert os.path.exists(context['video_path'])
+
+
+def test_measure_loudness_parses_loudnorm_json(tmp_path):
+    runner = RecordingFfmpeg(stderr=LOUDNORM_STDERR)
+    context = make_context(tmp_path, runner)
+
+    measured = measure_loudness_step(context, {})
+
+    args = runner.commands[0]
+    assert 'print_format=json' in option(args, '-filter_complex')
+    assert option(args, '-f') == 'null' and args[-1] == '-'
+    assert measured['input_i'] == '-23.54'
+    assert measured['target_offset'] == '0.01'
+    assert measured['normalization_type'] == 'dynamic'